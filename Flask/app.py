@@ -1,23 +1,86 @@
 #!/usr/bin/env python3
 
-from flask import Flask, render_template, url_for, request, json
-from flaskext.mysql import MySQL
-from werkzeug import generate_password_hash, check_password_hash
+import msgspec
+import orjson
+import pymysql
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHash
+from flask import Flask, Response, render_template, url_for, request, g
+from flask_caching import Cache
+from pymysqlpool.pool import Pool
+from werkzeug.security import check_password_hash
 
 app = Flask(__name__)
 
+# in-process cache for the static pages, rendered once per hour instead of on every request
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache'})
+
+# argon2id, tuned so that one hash takes ~50-100ms on the app server
+ph = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=1)
+
+# static JSON payloads are encoded once at import
+_MSG_CREATED = orjson.dumps({'message': 'User created successfully !'})
+_ERR_MISSING = orjson.dumps({'html': '<span>Enter the required fields</span>'})
+_ERR_EXISTS = orjson.dumps({'error': 'Username Exists !!'})
+
+
+class SignupReq(msgspec.Struct):
+    inputName: str
+    inputEmail: str
+    inputPassword: str
+
+
 # MySQL configurations
-mysql = MySQL()
 app.config['MYSQL_DATABASE_USER'] = 'flask'
 app.config['MYSQL_DATABASE_PASSWORD'] = ''
 app.config['MYSQL_DATABASE_DB'] = 'BucketList'
 app.config['MYSQL_DATABASE_HOST'] = ''
-mysql.init_app(app)
-conn = mysql.connect()
-cursor = conn.cursor()
+
+# Connection pool: every request borrows its own connection instead of sharing one global cursor
+pool = Pool(host=app.config['MYSQL_DATABASE_HOST'], user=app.config['MYSQL_DATABASE_USER'],
+            password=app.config['MYSQL_DATABASE_PASSWORD'], db=app.config['MYSQL_DATABASE_DB'],
+            min_size=1, max_size=20, cursorclass=pymysql.cursors.Cursor)
+pool.init()
+
+
+def get_conn():
+    if 'db_conn' not in g:
+        g.db_conn = pool.get_conn()
+    return g.db_conn
+
+
+@app.teardown_request
+def release_conn(exception):
+    # give the connection back to the pool even if the view raised,
+    # without leaving a half-done transaction for the next request
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        try:
+            conn.rollback()
+        finally:
+            pool.release(conn)
+
+
+def _json(obj, status=200):
+    # obj may be a dict or an already encoded payload
+    if not isinstance(obj, bytes):
+        obj = orjson.dumps(obj)
+    return Response(obj, status=status, mimetype='application/json')
+
+
+def _verify(stored_hash, supplied):
+    # both checks compare in constant time, never compare secrets with ==
+    if not stored_hash.startswith('$argon2'):
+        # users created before the switch to argon2 have Werkzeug pbkdf2 hashes
+        return check_password_hash(stored_hash, supplied)
+    try:
+        return ph.verify(stored_hash, supplied)
+    except (VerificationError, InvalidHash):
+        return False
 
 
 @app.route('/')
+@cache.cached(timeout=3600)
 # def index():
 #     return 'Index page'
 def main():
@@ -29,45 +92,43 @@ def main():
 
 
 @app.route('/showSignUp')
+@cache.cached(timeout=3600)
 def showSignUp():
     return render_template('signup.html')
 
 @app.route('/signUp', methods=['POST'])
 def signUp():
     # create user
-    # read the posted values from the UI
-    _name = request.form['inputName']
-    _email = request.form['inputEmail']
-    _password = request.form['inputPassword']
-
+    # read and validate the posted values from the UI
+    try:
+        req = msgspec.convert(request.form.to_dict(), SignupReq)
+    except msgspec.ValidationError:
+        return _json(_ERR_MISSING)
 
-    # validate the received values
+    _name, _email, _password = req.inputName, req.inputEmail, req.inputPassword
     if _name and _email and _password:
-        _hashed_password = generate_password_hash(_password)
-        cursor.callproc('sp_createUser', (_name, _email, _hashed_password))
-        data = cursor.fetchall()
-
-        if len(data) is 0:
+        _hashed_password = ph.hash(_password)
+        conn = get_conn()
+        cursor = conn.cursor()
+        try:
+            cursor.callproc('sp_createUser', (_name, _email, _hashed_password))
+            data = cursor.fetchall()
+        finally:
+            cursor.close()
+
+        # sp_createUser returns 1 if the user was created, 0 if the e-mail is already taken
+        # (see sql/sp_createUser.sql). End the transaction either way, the failed INSERT
+        # still holds a lock on the existing row.
+        if data and data[0][0]:
             conn.commit()
-            return json.dumps({'message': 'User created successfully !'})
+            return _json(_MSG_CREATED)
         else:
-            return json.dumps({'error': str(data[0])})
-        #return json.dumps({'html': '<span>All fields good !!</span>'})
+            conn.rollback()
+            return _json(_ERR_EXISTS)
     else:
-        return json.dumps({'html': '<span>Enter the required fields</span>'})
-
-
-
-
-
-
-
-
-
-
-
-    cursor.callproc('sp_createUser',(_name,_email,_hashed_password))
+        return _json(_ERR_MISSING)
 
 
 if __name__ == "__main__":
+    # development server only, production runs under gunicorn (gunicorn.conf.py)
     app.run()
@@ -0,0 +1,22 @@
+# Gunicorn settings for the Flask app (use it instead of app.run() in production).
+# Usage:
+#   gunicorn -c gunicorn.conf.py app:app
+# Static files are served by nginx, see nginx.conf.
+
+import multiprocessing
+
+bind = '127.0.0.1:8000'
+
+# Threaded workers: while one thread waits for MySQL (sp_createUser round-trip)
+# the other threads of the same worker keep serving requests, so one worker per
+# CPU is enough (2 * NCPU + 1 is the rule for sync workers).
+# Every worker process has its own connection pool from app.py and each thread
+# borrows one connection from it, so keep threads <= pool max_size.
+# Sizing limits, per host:
+#   MySQL connections: workers * threads at most (pool min_size=1 idle per worker),
+#     keep it below max_connections (151 by default)
+#   memory: workers * threads concurrent argon2 hashes of 64 MiB each
+#     (16 CPUs * 4 threads = 64 connections, ~4 GiB worst case)
+worker_class = 'gthread'
+workers = multiprocessing.cpu_count()
+threads = 4
@@ -0,0 +1,49 @@
+-- BucketList: unique index on the login e-mail and a single-statement sp_createUser.
+-- Usage (after user_password_argon2.sql), safe to run again:
+--   mysql -u root BucketList < sp_createUser.sql
+--
+-- The unique key can't be added while duplicate e-mails exist. Find them first with
+--   SELECT user_username, COUNT(*) FROM tbl_user GROUP BY user_username HAVING COUNT(*) > 1;
+-- and merge/remove the extra accounts by hand.
+--
+-- sp_createUser returns one row with an explicit flag:
+--   1 - user created
+--   0 - e-mail (user_username) already exists
+
+-- uniqueness is enforced by the index instead of a SELECT before every INSERT
+-- (MySQL has no ADD KEY IF NOT EXISTS, so check information_schema)
+DROP PROCEDURE IF EXISTS tmp_add_uq_user_username;
+
+DELIMITER $$
+CREATE PROCEDURE tmp_add_uq_user_username()
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM information_schema.statistics
+                   WHERE table_schema = DATABASE() AND table_name = 'tbl_user'
+                     AND index_name = 'uq_user_username') THEN
+        ALTER TABLE tbl_user ADD UNIQUE KEY uq_user_username (user_username);
+    END IF;
+END$$
+DELIMITER ;
+
+CALL tmp_add_uq_user_username();
+DROP PROCEDURE tmp_add_uq_user_username;
+
+DROP PROCEDURE IF EXISTS sp_createUser;
+
+DELIMITER $$
+CREATE PROCEDURE sp_createUser(
+    IN p_name VARCHAR(45),
+    IN p_username VARCHAR(45),
+    IN p_password VARCHAR(255)
+)
+BEGIN
+    -- duplicate key on uq_user_username: the e-mail is taken
+    -- (explicit flag, doesn't depend on ROW_COUNT() / CLIENT_FOUND_ROWS)
+    DECLARE EXIT HANDLER FOR 1062 SELECT 0;
+
+    INSERT INTO tbl_user (user_name, user_username, user_password)
+    VALUES (p_name, p_username, p_password);
+
+    SELECT 1;
+END$$
+DELIMITER ;
@@ -0,0 +1,7 @@
+-- BucketList: make room for argon2 password hashes (~100 chars, see ph in app.py).
+-- Usage:
+--   mysql -u root BucketList < user_password_argon2.sql
+--
+-- Existing Werkzeug pbkdf2 hashes stay valid, _verify() in app.py still checks them.
+
+ALTER TABLE tbl_user MODIFY user_password VARCHAR(255);
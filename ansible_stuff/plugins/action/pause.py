@@ -19,7 +19,8 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 import datetime
-import signal
+import os
+import select
 import sys
 import termios
 import time
@@ -158,24 +159,52 @@ except ImportError:
     HAS_CURSES = False
 
 if HAS_CURSES:
-    MOVE_TO_BOL = curses.tigetstr('cr')
-    CLEAR_TO_EOL = curses.tigetstr('el')
+    # tigetstr() returns None for capabilities the terminal does not have
+    MOVE_TO_BOL = curses.tigetstr('cr') or b'\r'
+    CLEAR_TO_EOL = curses.tigetstr('el') or b'\x1b[K'
 else:
     MOVE_TO_BOL = b'\r'
     CLEAR_TO_EOL = b'\x1b[K'
 
+# built once, clear_line() runs on every backspace
+CLEAR_LINE_SEQ = b'\x1b[' + MOVE_TO_BOL + b'\x1b[' + CLEAR_TO_EOL
+
+
+# keystroke classes, see the per-byte lookup table built in ActionModule.run()
+KEY_INPUT = 0
+KEY_INTR = 1
+KEY_ENTER = 2
+KEY_BACKSPACE = 3
+
 
 class AnsibleTimeoutExceeded(Exception):
     pass
 
 
-def timeout_handler(signum, frame):
-    raise AnsibleTimeoutExceeded
+def raw_settings(attrs, echo):
+    # same as tty.setraw(), but computed from already fetched attributes and
+    # optionally keeping ECHO, so raw mode is applied with a single tcsetattr
+    new_settings = list(attrs)
+    new_settings[6] = list(attrs[6])
+    if hasattr(tty, 'cfmakeraw'):
+        # Python 3.12+: exactly the flags tty.setraw() uses, which run() applies to stdout
+        tty.cfmakeraw(new_settings)
+    else:
+        # pinned copy of the tty.setraw() flags of Python < 3.12
+        new_settings[0] &= ~(termios.BRKINT | termios.ICRNL | termios.INPCK | termios.ISTRIP | termios.IXON)
+        new_settings[1] &= ~termios.OPOST
+        new_settings[2] &= ~(termios.CSIZE | termios.PARENB)
+        new_settings[2] |= termios.CS8
+        new_settings[3] &= ~(termios.ECHO | termios.ICANON | termios.IEXTEN | termios.ISIG)
+        new_settings[6][termios.VMIN] = 1
+        new_settings[6][termios.VTIME] = 0
+    if echo:
+        new_settings[3] |= termios.ECHO
+    return new_settings
 
 
 def clear_line(stdout):
-    stdout.write(b'\x1b[%s' % MOVE_TO_BOL)
-    stdout.write(b'\x1b[%s' % CLEAR_TO_EOL)
+    stdout.write(CLEAR_LINE_SEQ)
 
 
 class ActionModule(ActionBase):
@@ -225,7 +254,7 @@ class ActionModule(ActionBase):
         if 'prompt' in self._task.args:
             prompt = "[%s]\n%s%s:" % (self._task.get_name().strip(), self._task.args['prompt'], echo_prompt)
             if 'timeout_answer' in self._task.args:
-                timeout_answer = str.encode(self._task.args['timeout_answer'])
+                timeout_answer = self._task.args['timeout_answer'].encode()
         else:
             # If no custom prompt is specified, set a default prompt
             prompt = "[%s]\n%s%s:" % (self._task.get_name().strip(), 'Press enter to continue, Ctrl+C to interrupt', echo_prompt)
@@ -243,18 +272,20 @@ class ActionModule(ActionBase):
 
         start = time.time()
         result['start'] = to_text(datetime.datetime.now())
-        result['user_input'] = b''
+        # collected in place, converted to text once at the end
+        user_input = bytearray()
 
         stdin_fd = None
         old_settings = None
+        deadline = None
         try:
             if seconds is not None and 'prompt' not in self._task.args:
                 if seconds < 1:
                     seconds = 1
 
-                # setup the alarm handler
-                signal.signal(signal.SIGALRM, timeout_handler)
-                signal.alarm(seconds)
+                # input is waited for with select() until the deadline, on the monotonic
+                # clock so wall-clock steps don't shorten or stretch the pause
+                deadline = time.monotonic() + seconds
 
                 # show the timer and control prompts
                 display.display("Pausing for %d seconds%s" % (seconds, echo_prompt))
@@ -268,9 +299,9 @@ class ActionModule(ActionBase):
                 if seconds is not None:
                     if seconds < 1:
                         seconds = 1
-                    # setup the alarm handler
-                    signal.signal(signal.SIGALRM, timeout_handler)
-                    signal.alarm(seconds)
+                    # input is waited for with select() until the deadline, on the monotonic
+                    # clock so wall-clock steps don't shorten or stretch the pause
+                    deadline = time.monotonic() + seconds
                     display.display("Pausing for %s seconds!" % seconds)
 
                 display.display(prompt)
@@ -295,71 +326,104 @@ class ActionModule(ActionBase):
 
             if stdin_fd is not None:
                 if isatty(stdin_fd):
+                    # fetch the terminal attributes once, they are reused below
+                    old_settings = termios.tcgetattr(stdin_fd)
+
                     # grab actual Ctrl+C sequence
                     try:
-                        intr = termios.tcgetattr(stdin_fd)[6][termios.VINTR]
+                        intr = old_settings[6][termios.VINTR]
                     except Exception:
                         # unsupported/not present, use default
                         intr = b'\x03'  # value for Ctrl+C
 
                     # get backspace sequences
                     try:
-                        backspace = termios.tcgetattr(stdin_fd)[6][termios.VERASE]
+                        backspace = old_settings[6][termios.VERASE]
                     except Exception:
                         backspace = [b'\x7f', b'\x08']
 
-                    old_settings = termios.tcgetattr(stdin_fd)
-                    tty.setraw(stdin_fd)
+                    # classify every possible byte once, so reading input is a single
+                    # table lookup per key (later assignments take precedence)
+                    key_actions = bytearray(256)
+                    for key in (backspace if isinstance(backspace, list) else [backspace]):
+                        key_actions[ord(key)] = KEY_BACKSPACE
+                    key_actions[ord(b'\r')] = key_actions[ord(b'\n')] = KEY_ENTER
+                    key_actions[ord(intr)] = KEY_INTR
 
                     # Only set stdout to raw mode if it is a TTY. This is needed when redirecting
                     # stdout to a file since a file cannot be set to raw mode.
                     if isatty(stdout_fd):
                         tty.setraw(stdout_fd)
 
-                    # Only echo input if no timeout is specified
-                    if echo:
-                        new_settings = termios.tcgetattr(stdin_fd)
-                        new_settings[3] = new_settings[3] | termios.ECHO
-                        termios.tcsetattr(stdin_fd, termios.TCSANOW, new_settings)
+                    # raw mode for stdin, echoing input only if requested. Set after stdout,
+                    # which is usually the same terminal and would drop ECHO again
+                    termios.tcsetattr(stdin_fd, termios.TCSAFLUSH, raw_settings(old_settings, echo))
 
                     # flush the buffer to make sure no previous key presses
                     # are read in below
                     termios.tcflush(stdin, termios.TCIFLUSH)
 
+            # keys read together with Ctrl+C, they are the answer for _c_or_a()
+            pending_keys = b''
             while True:
 
                 try:
                     if stdin_fd is not None:
 
-                        key_pressed = stdin.read(1)
+                        # wait for input no longer than the remaining timeout
+                        if deadline is None:
+                            ready, _, _ = select.select([stdin_fd], [], [])
+                        else:
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                raise AnsibleTimeoutExceeded
+                            ready, _, _ = select.select([stdin_fd], [], [], remaining)
+                        if not ready:
+                            raise AnsibleTimeoutExceeded
 
-                        if key_pressed == intr:  # value for Ctrl+C
-                            clear_line(stdout)
-                            raise KeyboardInterrupt
+                        # take everything available (e.g. pasted text) in one read
+                        keys_pressed = os.read(stdin_fd, 64)
 
                     """ if not seconds """
                     if stdin_fd is None or not isatty(stdin_fd):
                         display.warning("Not waiting for response to prompt as stdin is not interactive")
                         break
 
+                    if not keys_pressed:
+                        # EOF on the terminal (e.g. hangup), nothing more will come
+                        break
+
                     # read key presses and act accordingly
-                    if key_pressed in (b'\r', b'\n'):
-                        clear_line(stdout)
+                    # (keys after Enter are dropped, as the next prompt flushes typed-ahead input anyway)
+                    entered = False
+                    keys = iter(bytearray(keys_pressed))
+                    for key in keys:
+                        action = key_actions[key]
+
+                        if action == KEY_INPUT:
+                            user_input.append(key)
+                        elif action == KEY_INTR:  # value for Ctrl+C
+                            clear_line(stdout)
+                            pending_keys = bytes(bytearray(keys))
+                            raise KeyboardInterrupt
+                        elif action == KEY_ENTER:
+                            clear_line(stdout)
+                            entered = True
+                            break
+                        else:
+                            # delete a character if backspace is pressed
+                            del user_input[-1:]
+                            clear_line(stdout)
+                            if echo:
+                                stdout.write(user_input)
+                            stdout.flush()
+
+                    if entered:
                         break
-                    elif key_pressed in backspace:
-                        # delete a character if backspace is pressed
-                        result['user_input'] = result['user_input'][:-1]
-                        clear_line(stdout)
-                        if echo:
-                            stdout.write(result['user_input'])
-                        stdout.flush()
-                    else:
-                        result['user_input'] += key_pressed
 
                 except KeyboardInterrupt:
-                    signal.alarm(0)
                     display.display("Press 'C' to continue the play or 'A' to abort \r"),
-                    if self._c_or_a(stdin):
+                    if self._c_or_a(stdin_fd, pending_keys):
                         clear_line(stdout)
                         break
 
@@ -369,12 +433,12 @@ class ActionModule(ActionBase):
 
         except AnsibleTimeoutExceeded:
             if 'prompt' in self._task.args and 'timeout_answer' in self._task.args:
-                result['user_input'] = timeout_answer
+                user_input[:] = timeout_answer
                 clear_line(stdout)
-                stdout.write(b'TimeoutExceeded. Timeout answer has been chosen: %s' % result['user_input'])
+                stdout.write(b'TimeoutExceeded. Timeout answer has been chosen: %s' % timeout_answer)
             else:
-                # this is the exception we expect when the alarm signal
-                # fires, so we simply ignore it to move into the cleanup
+                # this is the exception we expect when the timeout
+                # expires, so we simply ignore it to move into the cleanup
                 pass
         finally:
             # cleanup and save some information
@@ -388,12 +452,20 @@ class ActionModule(ActionBase):
             duration = round(duration, 2)
             result['stdout'] = "Paused for %s %s" % (duration, duration_unit)
 
-        result['user_input'] = to_text(result['user_input'], errors='surrogate_or_strict')
+        result['user_input'] = to_text(bytes(user_input), errors='surrogate_or_strict')
         return result
 
-    def _c_or_a(self, stdin):
+    def _c_or_a(self, stdin_fd, pending_keys=b''):
+        # keys already read by the prompt loop come first, then read the terminal
+        # with os.read() like the prompt loop does, so nothing stays in a Python buffer
         while True:
-            key_pressed = stdin.read(1)
+            if pending_keys:
+                key_pressed, pending_keys = pending_keys[:1], pending_keys[1:]
+            else:
+                key_pressed = os.read(stdin_fd, 1)
+                if not key_pressed:
+                    # EOF, nobody can answer
+                    return False
             if key_pressed.lower() == b'a':
                 return False
             elif key_pressed.lower() == b'c':
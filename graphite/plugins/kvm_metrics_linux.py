@@ -6,11 +6,22 @@ import psutil
 import time
 import argparse
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 
 """ Usage:
   ./kvm_metrics_linux.py -s "hypervisors.mig.staging.tempest" """
 
+def get_domain_specs(domain):
+    # every call below is a separate libvirt RPC, so domains are processed in parallel threads
+    #uuid = domain.UUIDString()
+    state, maxmem, mem, cpus, cput = domain.info()
+    vm_name = domain.name().replace(".", "_")
+    return [(vm_name, 'vm_state', state), (vm_name, 'vm_running', domain.isActive()),
+            (vm_name, 'vm_is_persistent', domain.isPersistent()), (vm_name, 'vm_ram_total_kb', maxmem),
+            (vm_name, 'vm_ram_kb', mem), (vm_name, 'vm_cpu_count_total', cpus)]
+
+
 def get_vm_info():
     argv_parser = argparse.ArgumentParser(description="Provides basic metrics for each VM on the HyperVisor",
                                           usage="kvm_metrics_linux.py -s 'hypervisors.mig.staging.tempest'")
@@ -18,6 +29,7 @@ def get_vm_info():
                                                     "like: --scheme :::hypervisors.mig.staging.tempest:::.RESULT_NAME RESULT_VALUE")
     args = vars(argv_parser.parse_args())
     HYPERVISOR_SPECS = {}
+    # flat (vm_name, metric, value) rows for all VMs
     VMS_SPECS = []
 
     mem = psutil.virtual_memory()
@@ -31,25 +43,19 @@ def get_vm_info():
 
     try:
 
-        domainIDs = conn.listDomainsID()
-        if domainIDs is None:
-            print('Failed to get domainIDs on the HyperVisor!', file=sys.stderr)
+        try:
+            domains = conn.listAllDomains(libvirt.VIR_CONNECT_LIST_DOMAINS_ACTIVE)
+        except libvirt.libvirtError as e:
+            print(f'Failed to get domains on the HyperVisor! {e}', file=sys.stderr)
             sys.exit(3)
         hostname = conn.getHostname()
 
         HYPERVISOR_SPECS.update({'ram_total': ram_total, 'ram_free': conn.getFreeMemory(), 'cpu_count_total': cpu_count_total,
-                                 'hostname': hostname.replace(".", "_"), 'running_vms': len(domainIDs)})
-
-        for domain_id in domainIDs:
-            domain = conn.lookupByID(domain_id)
-            #uuid = domain.UUIDString()
-            state, maxmem, mem, cpus, cput = domain.info()
-            vm_hostname = domain.name()
-            VMS_SPECS.append({'vm_name': vm_hostname.replace(".", "_"), 'vm_state': state, 'vm_running': domain.isActive(),
-                              'vm_is_persistent': domain.isPersistent(), 'vm_ram_total_kb': maxmem, 'vm_ram_kb': mem,
-                              'vm_cpu_count_total': cpus})
+                                 'hostname': hostname.replace(".", "_"), 'running_vms': len(domains)})
 
-        HYPERVISOR_SPECS.update({'vm_specs': VMS_SPECS})
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            for rows in executor.map(get_domain_specs, domains):
+                VMS_SPECS.extend(rows)
 
     except Exception:
         print("Can't get corresponding info.\n".format(traceback.format_exc()))
@@ -58,23 +64,17 @@ def get_vm_info():
     conn.close()
 
 
+    now = int(time.time())
+    scheme = args.get('scheme') or ''
+    prefix = f"{scheme}." if scheme else ""
+    # all lines go out with a single write on the binary stdout
+    out = bytearray()
     for key, value in HYPERVISOR_SPECS.items():
-        if 'scheme' in args and args['scheme'] != "" and args['scheme'] is not None:
-            if key != "vm_specs":
-                print("{0}.{1} {2} {3}".format(args['scheme'], key, value, int(time.time())))
-            else:
-                for vm in value:
-                    for k, v in vm.items():
-                        v_name = vm.get('vm_name')
-                        print("{0}.vm_specs.{1}.{2} {3} {4}".format(args['scheme'], v_name, k, v, int(time.time())))
-        else:
-            if key != "vm_specs":
-                print("{0} {1} {2}".format(key, value, int(time.time())))
-            else:
-                for vm in value:
-                    v_name = vm.get('vm_name')
-                    for k, v in vm.items():
-                        print("vm_specs.{0}.{1} {2} {3}".format(v_name, k, v, int(time.time())))
+        out += f"{prefix}{key} {value} {now}\n".encode()
+    for v_name, metric, value in VMS_SPECS:
+        out += f"{prefix}vm_specs.{v_name}.{metric} {value} {now}\n".encode()
+    sys.stdout.buffer.write(out)
+    sys.stdout.buffer.flush()
 
 
 if __name__ == "__main__":